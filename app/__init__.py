@@ -2,6 +2,8 @@ import os
 from flask import Flask
 
 from .database import init_database
+from .metrics import init_metrics
+from .rollups import rollup_store
 from .routes import register_routes
 
 
@@ -10,7 +12,19 @@ def create_app() -> Flask:
     app.secret_key = os.environ.get("FLASK_SECRET_KEY", "dev-secret-key")
     database_path = os.path.join(os.path.dirname(__file__), "data", "flights.sqlite")
     app.config["DATABASE_PATH"] = database_path
+    app.config["DASHBOARD_RENDER_WORKERS"] = int(
+        os.environ.get("DASHBOARD_RENDER_WORKERS", "4")
+    )
+    app.config["PREVIEW_SAMPLE_SIZE"] = int(
+        os.environ.get("PREVIEW_SAMPLE_SIZE", "5000")
+    )
+    app.config["PREVIEW_SAMPLE_SEED"] = int(os.environ.get("PREVIEW_SAMPLE_SEED", "42"))
+    app.config["EXPORT_CHUNK_ROWS"] = int(os.environ.get("EXPORT_CHUNK_ROWS", "50000"))
+    app.config["METRICS_ENABLED"] = os.environ.get("METRICS_ENABLED", "0") == "1"
+    app.config["METRICS_DEBUG_PANEL"] = os.environ.get("METRICS_DEBUG_PANEL", "0") == "1"
     init_database(database_path)
+    rollup_store.refresh_table(database_path, "flights")
+    init_metrics(app)
     register_routes(app)
     return app
 
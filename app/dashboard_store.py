@@ -50,6 +50,11 @@ class DashboardStore:
         item.rendered = rendered
         return item
 
+    def rename_view(self, old_name: str, new_name: str) -> None:
+        for item in self._items.values():
+            if item.view_name == old_name:
+                item.view_name = new_name
+
     def delete(self, item_id: str) -> None:
         self._items.pop(item_id, None)
 
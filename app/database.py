@@ -1,6 +1,7 @@
 import os
 import random
 import sqlite3
+import urllib.request
 from datetime import datetime, timedelta
 from typing import List, Tuple
 
@@ -76,6 +77,11 @@ def get_connection(database_path: str) -> sqlite3.Connection:
     return sqlite3.connect(database_path)
 
 
+def attach_readonly(connection: sqlite3.Connection, database_path: str, schema: str) -> None:
+    uri = f"file:{urllib.request.pathname2url(os.path.abspath(database_path))}?mode=ro"
+    connection.execute(f"ATTACH DATABASE ? AS {schema}", (uri,))
+
+
 def init_database(database_path: str, *, rows: int = 10_000) -> None:
     os.makedirs(os.path.dirname(database_path), exist_ok=True)
     connection = get_connection(database_path)
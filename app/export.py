@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import io
+from typing import Dict, Iterable, Iterator, List
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+EXPORT_FORMATS: Dict[str, str] = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+SCHEMA_PROBE_CHUNKS = 8
+
+
+def iter_dataframe_chunks(dataframe: pd.DataFrame, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    if dataframe.empty:
+        yield dataframe
+        return
+    for start in range(0, len(dataframe), chunk_rows):
+        yield dataframe.iloc[start : start + chunk_rows]
+
+
+def iter_export(chunks: Iterable[pd.DataFrame], export_format: str) -> Iterator[bytes]:
+    if export_format == "csv":
+        return _iter_csv(chunks)
+    if export_format == "parquet":
+        return _iter_parquet(chunks)
+    raise ValueError(f"Formato de exportação desconhecido: {export_format}")
+
+
+def _iter_csv(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    header = True
+    for chunk in chunks:
+        yield chunk.to_csv(index=False, header=header).encode("utf-8")
+        header = False
+
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self) -> None:
+        self._buffer: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        payload = bytes(data)
+        self._buffer.append(payload)
+        self._position += len(payload)
+        return len(payload)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        payload = b"".join(self._buffer)
+        self._buffer.clear()
+        return payload
+
+
+def _iter_parquet(chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    sink = _ChunkSink()
+    writer = None
+    pending: List[pa.Table] = []
+    try:
+        # Cada bloco vira um row group e os bytes são enviados logo em seguida
+        for chunk in chunks:
+            table = pa.Table.from_pandas(_with_unique_columns(chunk), preserve_index=False)
+            if writer is None:
+                pending.append(table)
+                schema = _unify_schemas(pending)
+                # Colunas só com NULL ainda não têm tipo: aguarda mais blocos antes de fixar o schema
+                if _has_null_fields(schema) and len(pending) < SCHEMA_PROBE_CHUNKS:
+                    continue
+                writer = pq.ParquetWriter(sink, _widen_null_fields(schema))
+                tables, pending = pending, []
+            else:
+                tables = [table]
+            for table in tables:
+                writer.write_table(table.cast(writer.schema))
+            payload = sink.drain()
+            if payload:
+                yield payload
+        if writer is None and pending:
+            writer = pq.ParquetWriter(sink, _widen_null_fields(_unify_schemas(pending)))
+            for table in pending:
+                writer.write_table(table.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    payload = sink.drain()
+    if payload:
+        yield payload
+
+
+def _with_unique_columns(chunk: pd.DataFrame) -> pd.DataFrame:
+    # Parquet não aceita nomes repetidos (ex.: SELECT * de um JOIN): id, id_2, id_3...
+    if chunk.columns.is_unique:
+        return chunk
+    seen = set()
+    names: List[str] = []
+    for name in map(str, chunk.columns):
+        candidate, suffix = name, 2
+        while candidate in seen:
+            candidate, suffix = f"{name}_{suffix}", suffix + 1
+        seen.add(candidate)
+        names.append(candidate)
+    return chunk.set_axis(names, axis=1)
+
+
+def _unify_schemas(tables: List[pa.Table]) -> pa.Schema:
+    return pa.unify_schemas(
+        [table.schema.remove_metadata() for table in tables], promote_options="permissive"
+    )
+
+
+def _has_null_fields(schema: pa.Schema) -> bool:
+    return any(pa.types.is_null(field.type) for field in schema)
+
+
+def _widen_null_fields(schema: pa.Schema) -> pa.Schema:
+    return pa.schema(
+        [
+            field.with_type(pa.large_string()) if pa.types.is_null(field.type) else field
+            for field in schema
+        ]
+    )
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, ContextManager, Dict, Iterator, List, Tuple
+
+from flask import Flask, before_render_template, g, has_request_context, request, template_rendered
+
+from .dashboard_store import dashboard_store
+from .views_store import view_store
+
+METRIC_PREFIX = "flightlab"
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_NULL_TIMER = nullcontext()
+
+
+class _Histogram:
+    def __init__(self) -> None:
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.buckets[index] += 1
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple[str, str], _Histogram] = {}
+        self._request_totals: Dict[Tuple[str, str, str], int] = {}
+        self._stages: Dict[str, _Histogram] = {}
+        self._cache: Dict[Tuple[str, str], int] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+    def observe_request(self, endpoint: str, method: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self._requests.setdefault((endpoint, method), _Histogram()).observe(seconds)
+            key = (endpoint, method, str(status))
+            self._request_totals[key] = self._request_totals.get(key, 0) + 1
+
+    def observe_stage(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stages.setdefault(stage, _Histogram()).observe(seconds)
+
+    def count_cache(self, cache: str, hit: bool) -> None:
+        if not self.enabled:
+            return
+        key = (cache, "hit" if hit else "miss")
+        with self._lock:
+            self._cache[key] = self._cache.get(key, 0) + 1
+
+    def register_gauge(self, name: str, help_text: str, callback: Callable[[], float]) -> None:
+        self._gauges[name] = (help_text, callback)
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            requests = {key: _copy(value) for key, value in self._requests.items()}
+            request_totals = dict(self._request_totals)
+            stages = {key: _copy(value) for key, value in self._stages.items()}
+            cache = dict(self._cache)
+
+        lines: List[str] = []
+        name = f"{METRIC_PREFIX}_http_requests_total"
+        lines += [f"# HELP {name} Requisições atendidas por rota.", f"# TYPE {name} counter"]
+        for (endpoint, method, status), total in sorted(request_totals.items()):
+            lines.append(f"{name}{_labels(endpoint=endpoint, method=method, status=status)} {total}")
+
+        name = f"{METRIC_PREFIX}_http_request_duration_seconds"
+        lines += [f"# HELP {name} Duração das requisições por rota.", f"# TYPE {name} histogram"]
+        for (endpoint, method), histogram in sorted(requests.items()):
+            lines += _histogram_lines(name, histogram, endpoint=endpoint, method=method)
+
+        name = f"{METRIC_PREFIX}_stage_duration_seconds"
+        lines += [f"# HELP {name} Duração das etapas internas.", f"# TYPE {name} histogram"]
+        for stage, histogram in sorted(stages.items()):
+            lines += _histogram_lines(name, histogram, stage=stage)
+
+        name = f"{METRIC_PREFIX}_cache_requests_total"
+        lines += [f"# HELP {name} Consultas a caches por resultado.", f"# TYPE {name} counter"]
+        for (cache_name, result), total in sorted(cache.items()):
+            lines.append(f"{name}{_labels(cache=cache_name, result=result)} {total}")
+
+        name = f"{METRIC_PREFIX}_cache_hit_ratio"
+        lines += [f"# HELP {name} Fração de acertos por cache.", f"# TYPE {name} gauge"]
+        for cache_name in sorted({key[0] for key in cache}):
+            hits = cache.get((cache_name, "hit"), 0)
+            total = hits + cache.get((cache_name, "miss"), 0)
+            lines.append(f"{name}{_labels(cache=cache_name)} {hits / total if total else 0.0}")
+
+        for gauge_name, (help_text, callback) in sorted(self._gauges.items()):
+            full_name = f"{METRIC_PREFIX}_{gauge_name}"
+            lines += [f"# HELP {full_name} {help_text}", f"# TYPE {full_name} gauge", f"{full_name} {callback()}"]
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+
+def stage_timer(stage: str) -> ContextManager[None]:
+    if not metrics.enabled:
+        return _NULL_TIMER
+    return _timed_stage(stage)
+
+
+@contextmanager
+def _timed_stage(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.observe_stage(stage, elapsed)
+        if has_request_context() and "metrics_stages" in g:
+            g.metrics_stages.append((stage, elapsed))
+
+
+def request_stages() -> List[Tuple[str, float]]:
+    if not has_request_context():
+        return []
+    return list(g.get("metrics_stages", []))
+
+
+def request_elapsed() -> float:
+    if not has_request_context() or "metrics_started" not in g:
+        return 0.0
+    return time.perf_counter() - g.metrics_started
+
+
+def init_metrics(app: Flask) -> None:
+    metrics.enabled = app.config["METRICS_ENABLED"]
+    if not metrics.enabled:
+        return
+
+    @app.before_request
+    def start_request_timer() -> None:
+        g.metrics_started = time.perf_counter()
+        g.metrics_stages = []
+
+    @app.after_request
+    def record_request(response):
+        elapsed = request_elapsed()
+        endpoint, method, status = request.endpoint or "unknown", request.method, response.status_code
+        if response.is_streamed:
+            # O corpo ainda não foi enviado: a duração só é conhecida ao fechar a resposta
+            started = g.metrics_started
+            response.call_on_close(
+                lambda: metrics.observe_request(
+                    endpoint, method, status, time.perf_counter() - started
+                )
+            )
+        else:
+            metrics.observe_request(endpoint, method, status, elapsed)
+        timings = [
+            f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in request_stages()
+        ]
+        timings.append(f"total;dur={elapsed * 1000:.2f}")
+        response.headers["Server-Timing"] = ", ".join(timings)
+        return response
+
+    def start_render(sender, template, context, **extra) -> None:
+        g.metrics_render_started = time.perf_counter()
+
+    def finish_render(sender, template, context, **extra) -> None:
+        started = g.pop("metrics_render_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        metrics.observe_stage("jinja_render", elapsed)
+        if "metrics_stages" in g:
+            g.metrics_stages.append(("jinja_render", elapsed))
+
+    before_render_template.connect(start_render, app, weak=False)
+    template_rendered.connect(finish_render, app, weak=False)
+
+    metrics.register_gauge("view_store_views", "Views em memória.", lambda: len(view_store.list()))
+    metrics.register_gauge(
+        "view_store_bytes", "Memória ocupada pelos DataFrames das views.", _view_store_bytes
+    )
+    metrics.register_gauge(
+        "dashboard_items", "Visualizações no dashboard.", lambda: len(dashboard_store.list())
+    )
+
+
+_view_bytes: Dict[str, Tuple[int, int]] = {}
+
+
+def _view_store_bytes() -> int:
+    # memory_usage(deep=True) percorre todas as strings: mede cada versão de view uma única vez
+    total = 0
+    current = {}
+    for stored in view_store.list():
+        cached = _view_bytes.get(stored.name)
+        if cached is None or cached[0] != stored.version:
+            cached = (stored.version, int(stored.dataframe.memory_usage(index=True, deep=True).sum()))
+        current[stored.name] = cached
+        total += cached[1]
+    _view_bytes.clear()
+    _view_bytes.update(current)
+    return total
+
+
+def _copy(histogram: _Histogram) -> _Histogram:
+    clone = _Histogram()
+    clone.buckets = list(histogram.buckets)
+    clone.total = histogram.total
+    clone.count = histogram.count
+    return clone
+
+
+def _labels(**labels: str) -> str:
+    rendered = ",".join(
+        f'{key}="{_escape_label(value)}"' for key, value in labels.items()
+    )
+    return "{" + rendered + "}"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _histogram_lines(name: str, histogram: _Histogram, **labels: str) -> List[str]:
+    lines = []
+    for bound, total in zip(DURATION_BUCKETS, histogram.buckets):
+        lines.append(f"{name}_bucket{_labels(**labels, le=repr(bound))} {total}")
+    lines.append(f"{name}_bucket{_labels(**labels, le='+Inf')} {histogram.count}")
+    lines.append(f"{name}_sum{_labels(**labels)} {histogram.total}")
+    lines.append(f"{name}_count{_labels(**labels)} {histogram.count}")
+    return lines
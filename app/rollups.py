@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import itertools
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, Optional, Sequence, Set, Tuple
+
+import pandas as pd
+
+from .database import get_connection
+from .views_store import StoredView
+
+ROLLUP_DIMENSIONS = ("airline", "status", "origin", "destination", "departure")
+ROLLUP_MEASURES = ("passengers", "distance_km")
+COUNT_COLUMN = "__count"
+
+_SELECT_ALL_PATTERN = re.compile(r"^\s*SELECT\s+\*\s+FROM\s+([A-Za-z_][\w]*)\s*;?\s*$", re.IGNORECASE)
+
+
+@dataclass
+class Rollup:
+    source: str
+    version: int
+    dimensions: Sequence[str]
+    measures: Sequence[str]
+    cuboids: Dict[FrozenSet[str], pd.DataFrame] = field(default_factory=dict)
+    view_versions: Set[int] = field(default_factory=set)
+    source_token: Optional[Tuple[int, ...]] = None
+
+    def find_cuboid(self, required: Iterable[str]) -> Optional[pd.DataFrame]:
+        required_set = frozenset(required)
+        if not required_set <= set(self.dimensions):
+            return None
+        candidates = [
+            cuboid
+            for dimensions, cuboid in self.cuboids.items()
+            if required_set <= dimensions
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=len)
+
+
+def build_cuboids(
+    base: pd.DataFrame, dimensions: Sequence[str], measures: Sequence[str]
+) -> Dict[FrozenSet[str], pd.DataFrame]:
+    aggregations = [COUNT_COLUMN, *measures]
+    cuboids: Dict[FrozenSet[str], pd.DataFrame] = {}
+    # Cada combinação é agregada a partir do cubo mais detalhado, nunca das linhas brutas
+    for size in range(len(dimensions), 0, -1):
+        for subset in itertools.combinations(dimensions, size):
+            if subset == tuple(dimensions):
+                cuboid = base
+            else:
+                cuboid = (
+                    base.groupby(list(subset), dropna=False, sort=False)[aggregations]
+                    .sum()
+                    .reset_index()
+                )
+            cuboids[frozenset(subset)] = cuboid
+    return cuboids
+
+
+def aggregate_dataframe(
+    dataframe: pd.DataFrame, dimensions: Sequence[str], measures: Sequence[str]
+) -> pd.DataFrame:
+    grouped = dataframe.groupby(list(dimensions), dropna=False, sort=False)
+    base = grouped.size().rename(COUNT_COLUMN).to_frame()
+    if measures:
+        base = base.join(grouped[list(measures)].sum())
+    return base.reset_index()
+
+
+class RollupStore:
+    def __init__(self) -> None:
+        self._view_rollups: Dict[str, Rollup] = {}
+        self._table_rollups: Dict[str, Rollup] = {}
+        self._enabled: Set[str] = set()
+
+    def is_enabled(self, view_name: str) -> bool:
+        return view_name in self._enabled
+
+    def enable(self, stored: StoredView) -> Optional[Rollup]:
+        self._enabled.add(stored.name)
+        return self.refresh_view(stored)
+
+    def disable(self, view_name: str) -> None:
+        self._enabled.discard(view_name)
+        self._view_rollups.pop(view_name, None)
+
+    def rename(self, old_name: str, new_name: str) -> None:
+        if old_name in self._enabled:
+            self._enabled.discard(old_name)
+            self._enabled.add(new_name)
+        rollup = self._view_rollups.pop(old_name, None)
+        if rollup is not None:
+            rollup.source = new_name
+            self._view_rollups[new_name] = rollup
+
+    def refresh_view(self, stored: StoredView) -> Optional[Rollup]:
+        if stored.name not in self._enabled:
+            return None
+        dimensions = [col for col in ROLLUP_DIMENSIONS if col in stored.dataframe.columns]
+        measures = [col for col in ROLLUP_MEASURES if col in stored.dataframe.columns]
+        if not dimensions:
+            self._view_rollups.pop(stored.name, None)
+            return None
+        base = aggregate_dataframe(stored.dataframe, dimensions, measures)
+        rollup = Rollup(
+            source=stored.name,
+            version=stored.version,
+            dimensions=dimensions,
+            measures=measures,
+            cuboids=build_cuboids(base, dimensions, measures),
+        )
+        self._view_rollups[stored.name] = rollup
+        return rollup
+
+    def refresh_table(
+        self, database_path: str, table_name: str, view_version: Optional[int] = None
+    ) -> Rollup:
+        token = _file_token(database_path)
+        previous = self._table_rollups.get(table_name)
+        if previous is not None and previous.source_token == token:
+            # Arquivo intacto desde a última agregação: basta validar a nova versão da view
+            if view_version is not None:
+                previous.view_versions.add(view_version)
+            return previous
+
+        dimensions = list(ROLLUP_DIMENSIONS)
+        measures = list(ROLLUP_MEASURES)
+        select_list = ", ".join(
+            dimensions
+            + [f"COUNT(*) AS {COUNT_COLUMN}"]
+            + [f"SUM({measure}) AS {measure}" for measure in measures]
+        )
+        sql_query = (
+            f"SELECT {select_list} FROM {table_name} GROUP BY {', '.join(dimensions)}"
+        )
+        connection = get_connection(database_path)
+        try:
+            base = pd.read_sql_query(sql_query, connection)
+        finally:
+            connection.close()
+        rollup = Rollup(
+            source=table_name,
+            version=0,
+            dimensions=dimensions,
+            measures=measures,
+            cuboids=build_cuboids(base, dimensions, measures),
+            view_versions=set() if view_version is None else {view_version},
+            source_token=token,
+        )
+        self._table_rollups[table_name] = rollup
+        return rollup
+
+    def refresh_source_table(self, database_path: str, stored: StoredView) -> Optional[Rollup]:
+        table_name = _source_table(stored)
+        if table_name is None or table_name not in self._table_rollups:
+            return None
+        return self.refresh_table(database_path, table_name, stored.version)
+
+    def for_view(self, stored: StoredView) -> Optional[Rollup]:
+        rollup = self._view_rollups.get(stored.name)
+        if rollup is not None and rollup.version == stored.version:
+            return rollup
+        table_name = _source_table(stored)
+        if table_name is not None:
+            rollup = self._table_rollups.get(table_name)
+            # Só vale para views lidas do mesmo estado da tabela que gerou o rollup
+            if rollup is not None and stored.version in rollup.view_versions:
+                return rollup
+        return None
+
+    def clear(self) -> None:
+        self._view_rollups.clear()
+        self._table_rollups.clear()
+        self._enabled.clear()
+
+
+def _file_token(database_path: str) -> Tuple[int, ...]:
+    token = []
+    for path in (database_path, f"{database_path}-wal"):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        token += [stat.st_mtime_ns, stat.st_size]
+    return tuple(token)
+
+
+def _source_table(stored: StoredView) -> Optional[str]:
+    if stored.source != "database":
+        return None
+    match = _SELECT_ALL_PATTERN.match(stored.query)
+    return match.group(1) if match else None
+
+
+rollup_store = RollupStore()
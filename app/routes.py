@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import itertools
 import json
 import sqlite3
+import unicodedata
 from ast import literal_eval
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+from urllib.parse import quote
 
 import pandas as pd
 import plotly.express as px
 from plotly.utils import PlotlyJSONEncoder
 from flask import (
     Flask,
+    Response,
+    abort,
+    flash,
     redirect,
     render_template,
     request,
@@ -17,16 +24,37 @@ from flask import (
 )
 
 from .dashboard_store import DashboardItem, dashboard_store
-from .database import get_connection, list_tables
+from .database import attach_readonly, describe_table, get_connection, list_tables
+from .export import EXPORT_FORMATS, iter_dataframe_chunks, iter_export
+from .metrics import metrics, request_elapsed, request_stages, stage_timer
+from .rollups import rollup_store
+from .sampling import sample_store
+from .table_render import render_table_json
+from .view_graph import build_dependency_graph, downstream_views, extract_referenced_tables
 from .views_store import StoredView, view_store
 
 ALLOWED_SQL_PREFIXES = ("SELECT", "WITH")
+BASE_SCHEMA = "base"
+
+T = TypeVar("T")
 
 
 def register_routes(app: Flask) -> None:
     @app.context_processor
-    def inject_globals() -> Dict[str, List[StoredView]]:
-        return {"views_in_memory": list(view_store.list())}
+    def inject_globals() -> Dict[str, object]:
+        return {
+            "views_in_memory": list(view_store.list()),
+            "rollup_enabled": rollup_store.is_enabled,
+            "metrics_debug_panel": metrics.enabled and app.config["METRICS_DEBUG_PANEL"],
+            "request_stages": request_stages,
+            "request_elapsed": request_elapsed,
+        }
+
+    @app.route("/metrics")
+    def metrics_endpoint():
+        if not metrics.enabled:
+            abort(404)
+        return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
 
     @app.route("/")
     def index():
@@ -63,9 +91,23 @@ def register_routes(app: Flask) -> None:
                     elif not sql_query.upper().startswith(ALLOWED_SQL_PREFIXES):
                         error = "Somente consultas iniciando com SELECT ou WITH são permitidas."
 
+            original_view = view_store.get(original_name) if original_name else None
+            if not error and original_view is not None and original_name != view_name:
+                # Views derivadas guardam o nome antigo no SQL e ficariam desatualizadas
+                dependents = downstream_views(view_store.list(), original_name)
+                if dependents:
+                    error = (
+                        f"Não é possível renomear '{original_name}': usada pelas views "
+                        f"derivadas {', '.join(dependents)}."
+                    )
+
             if not error:
                 try:
-                    dataframe = execute_sql_query(database_path, sql_query)
+                    dataframe = execute_source_query(
+                        database_path,
+                        sql_query,
+                        original_view.source if original_view is not None else "database",
+                    )
                 except Exception as exc:  # pragma: no cover - feedback to UI
                     error = f"Erro ao executar a consulta: {exc}"
                 else:
@@ -73,13 +115,24 @@ def register_routes(app: Flask) -> None:
                         if original_name:
                             if original_name != view_name:
                                 view_store.rename(original_name, view_name)
+                                rollup_store.rename(original_name, view_name)
+                                sample_store.discard(original_name)
+                                dashboard_store.rename_view(original_name, view_name)
                             view_store.update(view_name, sql_query, dataframe)
+                            _, failed = refresh_dependents(
+                                database_path,
+                                view_name,
+                                app.config["DASHBOARD_RENDER_WORKERS"],
+                            )
+                            if failed:
+                                error = describe_refresh_failures(failed)
                         else:
                             if view_store.get(view_name):
                                 raise KeyError(
                                     f"Já existe uma view chamada '{view_name}'."
                                 )
-                            view_store.save(view_name, sql_query, dataframe)
+                            stored = view_store.save(view_name, sql_query, dataframe)
+                            rollup_store.refresh_source_table(database_path, stored)
                         success = f"View '{view_name}' salva com sucesso."
                     except KeyError as exc:
                         error = str(exc)
@@ -97,6 +150,20 @@ def register_routes(app: Flask) -> None:
     @app.route("/views/<view_name>/delete", methods=["POST"])
     def delete_view(view_name: str):
         view_store.delete(view_name)
+        sample_store.discard(view_name)
+        rollup_store.disable(view_name)
+        return redirect(url_for("manage_views"))
+
+    @app.route("/views/<view_name>/rollup", methods=["POST"])
+    def toggle_view_rollup(view_name: str):
+        stored = view_store.get(view_name)
+        if stored is None:
+            return redirect(url_for("manage_views"))
+
+        if rollup_store.is_enabled(view_name):
+            rollup_store.disable(view_name)
+        else:
+            rollup_store.enable(stored)
         return redirect(url_for("manage_views"))
 
     @app.route("/views/<view_name>/refresh", methods=["POST"])
@@ -107,14 +174,32 @@ def register_routes(app: Flask) -> None:
             return redirect(url_for("manage_views"))
 
         try:
-            dataframe = execute_sql_query(database_path, stored.query)
-        except Exception:
+            dataframe = execute_view_query(database_path, stored)
+        except Exception as exc:
             # Mantém os dados antigos se der erro na consulta original
-            pass
+            flash(f"Erro ao atualizar a view '{view_name}': {exc}")
         else:
             view_store.update(view_name, stored.query, dataframe)
+            _, failed = refresh_dependents(
+                database_path, view_name, app.config["DASHBOARD_RENDER_WORKERS"]
+            )
+            if failed:
+                flash(describe_refresh_failures(failed))
         return redirect(url_for("manage_views"))
 
+    @app.route("/views/<view_name>/export.<export_format>")
+    def export_view(view_name: str, export_format: str):
+        stored = view_store.get(view_name)
+        if stored is None or export_format not in EXPORT_FORMATS:
+            abort(404)
+
+        chunks = iter_dataframe_chunks(stored.dataframe, app.config["EXPORT_CHUNK_ROWS"])
+        try:
+            return _export_response(chunks, export_format, view_name)
+        except Exception as exc:
+            flash(f"Erro ao exportar a view '{view_name}': {exc}")
+            return redirect(url_for("manage_views"))
+
     @app.route("/views/<view_name>/edit")
     def edit_view(view_name: str):
         if not view_store.get(view_name):
@@ -139,16 +224,14 @@ def register_routes(app: Flask) -> None:
             if not selected_columns:
                 error = "Selecione ao menos uma coluna para verificar duplicidade."
             else:
-                df = stored_view.dataframe
-                duplicated_mask = df.duplicated(subset=selected_columns, keep=False)
-                duplicates_df = df.loc[duplicated_mask]
-                if not duplicates_df.empty:
-                    duplicates_df = duplicates_df.sort_values(selected_columns)
-                duplicates_count = int(df.duplicated(subset=selected_columns).sum())
+                with stage_timer("pandas_duplicates"):
+                    duplicates_df, duplicates_count = find_duplicates(
+                        stored_view.dataframe, selected_columns
+                    )
                 has_duplicates = duplicates_count > 0
 
-        duplicates_html = (
-            duplicates_df.to_html(classes="table table-striped table-sm", index=False)
+        duplicates_table = (
+            render_table_json(duplicates_df)
             if duplicates_df is not None and not duplicates_df.empty
             else None
         )
@@ -159,7 +242,7 @@ def register_routes(app: Flask) -> None:
             selected_view=selected_view_name,
             columns=columns,
             selected_columns=selected_columns,
-            duplicates_html=duplicates_html,
+            duplicates_table=duplicates_table,
             duplicates_count=duplicates_count,
             has_duplicates=has_duplicates,
             error=error,
@@ -220,7 +303,7 @@ def register_routes(app: Flask) -> None:
 
             item_id = request.form.get("item_id") or None
 
-            if action in {"preview", "add", "update"}:
+            if action in {"preview", "preview_full", "add", "update"}:
                 if not selected_view_name:
                     error = "Escolha uma view para construir a visualização."
                 else:
@@ -229,6 +312,12 @@ def register_routes(app: Flask) -> None:
                         viz_type_value,
                         columns_state,
                         existing_filters_text if edit_item else "",
+                        sample_size=(
+                            app.config["PREVIEW_SAMPLE_SIZE"]
+                            if action == "preview"
+                            else None
+                        ),
+                        sample_seed=app.config["PREVIEW_SAMPLE_SEED"],
                     )
                     if "error" in result:
                         error = result["error"]
@@ -341,65 +430,335 @@ def register_routes(app: Flask) -> None:
         action = request.form.get("action") if request.method == "POST" else None
         error = None
         success = None
-        result_html = None
+        result_table = None
+        approximate = False
 
         if request.method == "POST":
             if not sql_query:
                 error = "Informe uma consulta SQL."
             else:
+                sample_size = (
+                    app.config["PREVIEW_SAMPLE_SIZE"] if action == "run" else None
+                )
                 try:
-                    dataframe = execute_on_views(sql_query)
+                    dataframe = execute_on_views(
+                        sql_query,
+                        database_path=app.config["DATABASE_PATH"],
+                        sample_size=sample_size,
+                        sample_seed=app.config["PREVIEW_SAMPLE_SEED"],
+                    )
                 except Exception as exc:
                     error = f"Erro ao executar a consulta: {exc}"
                 else:
-                    result_html = dataframe.to_html(
-                        classes="table table-striped table-sm", index=False
-                    )
+                    result_table = render_table_json(dataframe)
+                    if sample_size is not None:
+                        approximate = _query_uses_sampled_views(sql_query, sample_size)
                     if action == "save" and new_view_name:
                         if view_store.get(new_view_name):
                             error = f"Já existe uma view chamada '{new_view_name}'."
                         else:
-                            view_store.save(new_view_name, sql_query, dataframe)
+                            view_store.save(
+                                new_view_name, sql_query, dataframe, source="views"
+                            )
                             success = f"View '{new_view_name}' criada a partir da sandbox."
 
         view_summaries = _build_view_summaries()
+        base_summaries = _build_base_summaries(app.config["DATABASE_PATH"])
 
         return render_template(
             "sandbox.html",
             sql_query=sql_query,
-            result_html=result_html,
+            result_table=result_table,
+            approximate=approximate,
+            sample_size=app.config["PREVIEW_SAMPLE_SIZE"],
             error=error,
             success=success,
             view_summaries=view_summaries,
+            base_summaries=base_summaries,
+        )
+
+    @app.route("/sandbox/export", methods=["POST"])
+    def export_sandbox():
+        sql_query = request.form.get("sql_query") or ""
+        export_format = request.form.get("export_format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            abort(404)
+
+        error = None
+        if not sql_query:
+            error = "Informe uma consulta SQL."
+        else:
+            chunks = iter_on_views(
+                sql_query,
+                app.config["EXPORT_CHUNK_ROWS"],
+                database_path=app.config["DATABASE_PATH"],
+            )
+            try:
+                # Executa a consulta e codifica o primeiro bloco antes de iniciar a resposta,
+                # para reportar erros na página em vez de enviar um arquivo truncado
+                return _export_response(chunks, export_format, "sandbox")
+            except Exception as exc:
+                error = f"Erro ao exportar a consulta: {exc}"
+
+        return render_template(
+            "sandbox.html",
+            sql_query=sql_query,
+            result_table=None,
+            approximate=False,
+            sample_size=app.config["PREVIEW_SAMPLE_SIZE"],
+            error=error,
+            success=None,
+            view_summaries=_build_view_summaries(),
+            base_summaries=_build_base_summaries(app.config["DATABASE_PATH"]),
         )
 
 
+def _export_response(chunks: Iterator[pd.DataFrame], export_format: str, filename: str) -> Response:
+    body = iter_export(chunks, export_format)
+    first_payload = next(body, b"")
+    response = Response(
+        itertools.chain([first_payload], body), mimetype=EXPORT_FORMATS[export_format]
+    )
+    response.headers.set(
+        "Content-Disposition", "attachment", **_attachment_filename(f"{filename}.{export_format}")
+    )
+    return response
+
+
+def _attachment_filename(filename: str) -> Dict[str, str]:
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        # Nomes não-ASCII vão em filename* (RFC 2231), com um fallback ASCII em filename
+        stem, _, extension = filename.rpartition(".")
+        fallback = unicodedata.normalize("NFKD", stem).encode("ascii", "ignore").decode("ascii")
+        return {
+            "filename": f"{fallback or 'export'}.{extension}",
+            "filename*": f"UTF-8''{quote(filename, safe='')}",
+        }
+    return {"filename": filename}
+
+
 def execute_sql_query(database_path: str, sql_query: str) -> pd.DataFrame:
     connection = get_connection(database_path)
     try:
-        return pd.read_sql_query(sql_query, connection)
+        with stage_timer("sqlite_read_sql_query"):
+            return pd.read_sql_query(sql_query, connection)
     finally:
         connection.close()
 
 
-def execute_on_views(sql_query: str) -> pd.DataFrame:
-    memory_connection = sqlite3.connect(":memory:")
+def execute_on_views(
+    sql_query: str,
+    database_path: Optional[str] = None,
+    sample_size: Optional[int] = None,
+    sample_seed: int = 0,
+) -> pd.DataFrame:
+    memory_connection = _open_views_connection(database_path)
     try:
-        for stored in view_store.list():
-            stored.dataframe.to_sql(stored.name, memory_connection, index=False, if_exists="replace")
-        return pd.read_sql_query(sql_query, memory_connection)
+
+        def read() -> pd.DataFrame:
+            with stage_timer("views_read_sql_query"):
+                return pd.read_sql_query(sql_query, memory_connection)
+
+        return _run_with_views(memory_connection, sql_query, read, sample_size, sample_seed)
     finally:
         memory_connection.close()
 
 
-def build_visualization(view_name: str, viz_type: str, columns: Dict[str, Optional[str]], filters_text: str) -> Dict[str, str]:
+def iter_on_views(
+    sql_query: str, chunk_rows: int, database_path: Optional[str] = None
+) -> Iterator[pd.DataFrame]:
+    memory_connection = _open_views_connection(database_path)
+    try:
+        cursor = _run_with_views(
+            memory_connection,
+            sql_query,
+            lambda: memory_connection.execute(sql_query),
+            None,
+            0,
+        )
+        columns = [description[0] for description in cursor.description or ()]
+        emitted = False
+        while True:
+            rows = cursor.fetchmany(chunk_rows)
+            if not rows:
+                break
+            emitted = True
+            yield pd.DataFrame.from_records(rows, columns=columns)
+        if not emitted:
+            yield pd.DataFrame(columns=columns)
+    finally:
+        memory_connection.close()
+
+
+def _open_views_connection(database_path: Optional[str]) -> sqlite3.Connection:
+    memory_connection = sqlite3.connect(":memory:", uri=True)
+    if database_path:
+        # O banco base fica acessível como base.<tabela>, sem cópia e somente leitura
+        attach_readonly(memory_connection, database_path, BASE_SCHEMA)
+    return memory_connection
+
+
+def _run_with_views(
+    connection: sqlite3.Connection,
+    sql_query: str,
+    run: Callable[[], T],
+    sample_size: Optional[int],
+    sample_seed: int,
+) -> T:
+    loaded: Set[str] = set()
+    referenced = {name.lower() for name in extract_referenced_tables(sql_query)}
+    with stage_timer("views_to_sql"):
+        _load_views(connection, referenced, loaded, sample_size, sample_seed)
+    try:
+        return run()
+    except (sqlite3.OperationalError, pd.errors.DatabaseError) as exc:
+        # Só repete se a tabela ausente for uma view ainda não carregada (não um erro de digitação)
+        missing = _missing_table(str(exc))
+        if missing is None or not any(
+            stored.name.lower() == missing and stored.name not in loaded
+            for stored in view_store.list()
+        ):
+            raise
+    # Alguma referência não foi reconhecida no SQL: carrega as demais views e repete
+    with stage_timer("views_to_sql"):
+        _load_views(connection, None, loaded, sample_size, sample_seed)
+    return run()
+
+
+def _missing_table(message: str) -> Optional[str]:
+    _, marker, name = message.partition("no such table:")
+    if not marker:
+        return None
+    return name.strip().split(".")[-1].lower()
+
+
+def _load_views(
+    connection: sqlite3.Connection,
+    names: Optional[Set[str]],
+    loaded: Set[str],
+    sample_size: Optional[int],
+    sample_seed: int,
+) -> None:
+    for stored in view_store.list():
+        if stored.name in loaded or (names is not None and stored.name.lower() not in names):
+            continue
+        dataframe = (
+            sample_store.get(stored, sample_size, sample_seed)
+            if sample_size is not None
+            else stored.dataframe
+        )
+        dataframe.to_sql(stored.name, connection, index=False, if_exists="replace")
+        loaded.add(stored.name)
+
+
+def execute_view_query(database_path: str, stored: StoredView) -> pd.DataFrame:
+    return execute_source_query(database_path, stored.query, stored.source)
+
+
+def execute_source_query(database_path: str, sql_query: str, source: str) -> pd.DataFrame:
+    if source == "views":
+        return execute_on_views(sql_query, database_path=database_path)
+    return execute_sql_query(database_path, sql_query)
+
+
+def refresh_dependents(
+    database_path: str, view_name: str, max_workers: int
+) -> Tuple[List[str], Dict[str, str]]:
+    refreshed = [view_name]
+    failed: Dict[str, str] = {}
+    stored = view_store.get(view_name)
+    if stored is not None:
+        rollup_store.refresh_view(stored)
+        rollup_store.refresh_source_table(database_path, stored)
+    upstream = build_dependency_graph(view_store.list())
+    for name in downstream_views(view_store.list(), view_name):
+        stored = view_store.get(name)
+        if stored is None:
+            continue
+        # Reexecutar sobre uma view que falhou leria dados antigos como se fossem novos
+        failed_parents = sorted(upstream.get(name, set()) & failed.keys())
+        if failed_parents:
+            failed[name] = f"depende de {', '.join(failed_parents)}"
+            continue
+        try:
+            dataframe = execute_on_views(stored.query, database_path=database_path)
+        except Exception as exc:
+            # View derivada inválida mantém os dados anteriores
+            failed[name] = str(exc)
+            continue
+        stored = view_store.update(name, stored.query, dataframe)
+        rollup_store.refresh_view(stored)
+        refreshed.append(name)
+    rerender_dashboard_items(refreshed, max_workers)
+    return refreshed, failed
+
+
+def describe_refresh_failures(failed: Dict[str, str]) -> str:
+    details = "; ".join(f"{name} ({reason})" for name, reason in failed.items())
+    return f"Views derivadas não atualizadas, mantidas com os dados anteriores: {details}."
+
+
+def rerender_dashboard_items(view_names: List[str], max_workers: int) -> None:
+    affected = set(view_names)
+    items = [item for item in dashboard_store.list() if item.view_name in affected]
+    if not items:
+        return
+
+    def render(item: DashboardItem) -> Dict[str, str]:
+        return build_visualization(
+            item.view_name, item.viz_type, item.columns, item.filters_text
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(items)))) as executor:
+        results = list(executor.map(render, items))
+
+    for item, result in zip(items, results):
+        if "error" in result:
+            continue
+        dashboard_store.update(
+            item.id,
+            item.name,
+            item.view_name,
+            item.viz_type,
+            item.columns,
+            item.filters_text,
+            result,
+        )
+
+
+def build_visualization(
+    view_name: str,
+    viz_type: str,
+    columns: Dict[str, Optional[str]],
+    filters_text: str,
+    sample_size: Optional[int] = None,
+    sample_seed: int = 0,
+) -> Dict[str, str]:
     stored_view = view_store.get(view_name)
     if stored_view is None:
         return {"error": "View selecionada não existe mais."}
 
-    dataframe = stored_view.dataframe.copy()
+    if viz_type == "pie":
+        rollup_result = _build_pie_from_rollup(stored_view, columns, filters_text)
+        metrics.count_cache("rollup", rollup_result is not None)
+        if rollup_result is not None:
+            return rollup_result
+
+    source = stored_view.dataframe
+    sample_info: Dict[str, str] = {}
+    if sample_size is not None and len(source) > sample_size:
+        source = sample_store.get(stored_view, sample_size, sample_seed)
+        sample_info = {
+            "sample_rows": str(len(source)),
+            "total_rows": str(len(stored_view.dataframe)),
+        }
+
+    dataframe = source.copy()
     try:
-        dataframe = apply_filters(dataframe, filters_text)
+        with stage_timer("pandas_filter"):
+            dataframe = apply_filters(dataframe, filters_text)
     except ValueError as exc:
         return {"error": str(exc)}
 
@@ -412,9 +771,8 @@ def build_visualization(view_name: str, viz_type: str, columns: Dict[str, Option
             dataframe = dataframe[selected_columns]
         return {
             "type": "table",
-            "table_html": dataframe.head(500).to_html(
-                classes="table table-striped table-sm", index=False
-            ),
+            "table_json": render_table_json(dataframe, limit=500),
+            **sample_info,
         }
 
     if dataframe.empty:
@@ -424,16 +782,63 @@ def build_visualization(view_name: str, viz_type: str, columns: Dict[str, Option
         names, values = columns.get("names"), columns.get("values")
         if not names or not values:
             return {"error": "Informe as colunas de rótulo e valor para o gráfico de pizza."}
-        fig = px.pie(dataframe, names=names, values=values)
+        with stage_timer("plotly_figure"):
+            fig = px.pie(dataframe, names=names, values=values)
     else:
         return {"error": f"Tipo de visualização desconhecido: {viz_type}"}
 
+    with stage_timer("json_encode"):
+        graph_json = json.dumps(fig, cls=PlotlyJSONEncoder)
+    return {
+        "type": "chart",
+        "graph_json": graph_json,
+        **sample_info,
+    }
+
+
+def _build_pie_from_rollup(
+    stored_view: StoredView, columns: Dict[str, Optional[str]], filters_text: str
+) -> Optional[Dict[str, str]]:
+    names, values = columns.get("names"), columns.get("values")
+    if not names or not values:
+        return None
+    rollup = rollup_store.for_view(stored_view)
+    if rollup is None or values not in rollup.measures:
+        return None
+
+    cuboid = rollup.find_cuboid([names, *_filter_columns(filters_text)])
+    if cuboid is None:
+        return None
+    try:
+        with stage_timer("pandas_filter"):
+            filtered = apply_filters(cuboid, filters_text)
+    except ValueError:
+        return None
+    if filtered.empty:
+        return None
+
+    aggregated = (
+        filtered.groupby(names, dropna=False, sort=False)[values].sum().reset_index()
+    )
+    with stage_timer("plotly_figure"):
+        fig = px.pie(aggregated, names=names, values=values)
+    with stage_timer("json_encode"):
+        graph_json = json.dumps(fig, cls=PlotlyJSONEncoder)
     return {
         "type": "chart",
-        "graph_json": json.dumps(fig, cls=PlotlyJSONEncoder),
+        "graph_json": graph_json,
     }
 
 
+def find_duplicates(dataframe: pd.DataFrame, columns: List[str]) -> Tuple[pd.DataFrame, int]:
+    duplicated_mask = dataframe.duplicated(subset=columns, keep=False)
+    duplicates_df = dataframe.loc[duplicated_mask]
+    if not duplicates_df.empty:
+        duplicates_df = duplicates_df.sort_values(columns)
+    duplicates_count = int(dataframe.duplicated(subset=columns).sum())
+    return duplicates_df, duplicates_count
+
+
 def apply_filters(dataframe: pd.DataFrame, filters_text: str) -> pd.DataFrame:
     if not filters_text:
         return dataframe
@@ -477,6 +882,10 @@ def apply_filters(dataframe: pd.DataFrame, filters_text: str) -> pd.DataFrame:
     return filtered
 
 
+def _filter_columns(filters_text: str) -> List[str]:
+    return [line.split()[0] for line in (filters_text or "").splitlines() if line.strip()]
+
+
 def _parse_value(raw_value: str):
     text = raw_value.strip()
     try:
@@ -485,6 +894,15 @@ def _parse_value(raw_value: str):
         return text.strip("\"")
 
 
+def _query_uses_sampled_views(sql_query: str, sample_size: int) -> bool:
+    referenced = {name.lower() for name in extract_referenced_tables(sql_query)}
+    return any(
+        len(stored.dataframe) > sample_size
+        for stored in view_store.list()
+        if stored.name.lower() in referenced
+    )
+
+
 def _parse_columns_list(value: Optional[str], available: List[str]) -> List[str]:
     if not value:
         return []
@@ -512,13 +930,19 @@ def _build_view_summaries() -> List[Tuple[str, List[Tuple[str, str]]]]:
     summaries = []
     for stored in view_store.list():
         columns: List[Tuple[str, str]] = []
-        for column in stored.dataframe.columns:
-            dtype = str(stored.dataframe[column].dtype)
-            columns.append((column, dtype))
+        for column, dtype in stored.dataframe.dtypes.items():
+            columns.append((column, str(dtype)))
         summaries.append((stored.name, columns))
     return summaries
 
 
+def _build_base_summaries(database_path: str) -> List[Tuple[str, List[Tuple[str, str]]]]:
+    return [
+        (f"{BASE_SCHEMA}.{table}", describe_table(database_path, table))
+        for table in list_tables(database_path)
+    ]
+
+
 def _build_dashboard_filter_metadata(item: DashboardItem) -> Dict[str, List[str]]:
     available_columns = _get_view_columns(item.view_name)
     used_columns = _extract_visual_columns(item.viz_type, item.columns, available_columns)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import math
+import random
+import sys
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from .metrics import metrics
+from .views_store import StoredView
+
+
+def reservoir_sample_indices(total: int, size: int, seed: int) -> List[int]:
+    if size <= 0:
+        return []
+    reservoir = list(range(min(size, total)))
+    if total <= size:
+        return reservoir
+
+    # Algoritmo L: pula blocos de linhas em vez de sortear uma a uma
+    rng = random.Random(seed)
+
+    def uniform() -> float:
+        return max(rng.random(), sys.float_info.min)
+
+    weight = math.exp(math.log(uniform()) / size)
+    position = size - 1
+    while True:
+        position += math.floor(math.log(uniform()) / math.log(1 - weight)) + 1
+        if position >= total:
+            break
+        reservoir[rng.randrange(size)] = position
+        weight *= math.exp(math.log(uniform()) / size)
+    return reservoir
+
+
+class SampleStore:
+    def __init__(self) -> None:
+        self._samples: Dict[str, Tuple[int, int, int, pd.DataFrame]] = {}
+
+    def get(self, stored: StoredView, size: int, seed: int) -> pd.DataFrame:
+        dataframe = stored.dataframe
+        if len(dataframe) <= size:
+            return dataframe
+
+        cached = self._samples.get(stored.name)
+        if cached is not None and cached[:3] == (stored.version, size, seed):
+            metrics.count_cache("sample", True)
+            return cached[3]
+        metrics.count_cache("sample", False)
+
+        indices = sorted(reservoir_sample_indices(len(dataframe), size, seed))
+        sample = dataframe.iloc[indices].reset_index(drop=True)
+        self._samples[stored.name] = (stored.version, size, seed, sample)
+        return sample
+
+    def discard(self, name: str) -> None:
+        self._samples.pop(name, None)
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+
+sample_store = SampleStore()
@@ -0,0 +1,120 @@
+(function () {
+  const ROW_HEIGHT = 32;
+  const OVERSCAN = 12;
+
+  function formatCell(value, type) {
+    if (value === null || value === undefined) {
+      return '';
+    }
+    if (type === 'bool') {
+      return value ? 'True' : 'False';
+    }
+    return String(value);
+  }
+
+  function renderColumnarTable(container) {
+    const source = document.getElementById(container.dataset.payload);
+    if (!source) {
+      return;
+    }
+    const payload = JSON.parse(source.textContent);
+    const columns = payload.columns;
+    const types = payload.types;
+    const data = payload.data;
+    const rowCount = payload.rows;
+
+    const viewport = document.createElement('div');
+    viewport.className = 'columnar-table-viewport';
+    const table = document.createElement('table');
+    table.className = 'table table-sm mb-0';
+    const thead = document.createElement('thead');
+    const headerRow = document.createElement('tr');
+    columns.forEach((column, index) => {
+      const th = document.createElement('th');
+      th.textContent = column;
+      if (types[index] === 'int' || types[index] === 'float') {
+        th.classList.add('text-end');
+      }
+      headerRow.appendChild(th);
+    });
+    thead.appendChild(headerRow);
+    const tbody = document.createElement('tbody');
+    table.appendChild(thead);
+    table.appendChild(tbody);
+    viewport.appendChild(table);
+    container.appendChild(viewport);
+
+    if (payload.total_rows > rowCount) {
+      const note = document.createElement('div');
+      note.className = 'small text-secondary mt-2';
+      note.textContent = `Exibindo ${rowCount} de ${payload.total_rows} linhas.`;
+      container.appendChild(note);
+    }
+
+    function spacer(height) {
+      const row = document.createElement('tr');
+      row.className = 'columnar-table-spacer';
+      const cell = document.createElement('td');
+      cell.colSpan = Math.max(columns.length, 1);
+      cell.style.height = `${height}px`;
+      row.appendChild(cell);
+      return row;
+    }
+
+    let renderedStart = -1;
+    let renderedEnd = -1;
+    function draw() {
+      const visible = Math.ceil(viewport.clientHeight / ROW_HEIGHT) || 1;
+      const start = Math.max(0, Math.floor(viewport.scrollTop / ROW_HEIGHT) - OVERSCAN);
+      const end = Math.min(rowCount, start + visible + OVERSCAN * 2);
+      if (start === renderedStart && end === renderedEnd) {
+        return;
+      }
+      renderedStart = start;
+      renderedEnd = end;
+
+      const fragment = document.createDocumentFragment();
+      if (start > 0) {
+        fragment.appendChild(spacer(start * ROW_HEIGHT));
+      }
+      for (let rowIndex = start; rowIndex < end; rowIndex += 1) {
+        const row = document.createElement('tr');
+        if (rowIndex % 2 === 1) {
+          row.className = 'columnar-table-alt';
+        }
+        for (let columnIndex = 0; columnIndex < columns.length; columnIndex += 1) {
+          const cell = document.createElement('td');
+          const type = types[columnIndex];
+          cell.textContent = formatCell(data[columnIndex][rowIndex], type);
+          if (type === 'int' || type === 'float') {
+            cell.classList.add('text-end');
+          }
+          row.appendChild(cell);
+        }
+        fragment.appendChild(row);
+      }
+      if (end < rowCount) {
+        fragment.appendChild(spacer((rowCount - end) * ROW_HEIGHT));
+      }
+      tbody.replaceChildren(fragment);
+    }
+
+    let scheduled = false;
+    viewport.addEventListener('scroll', () => {
+      if (scheduled) {
+        return;
+      }
+      scheduled = true;
+      window.requestAnimationFrame(() => {
+        scheduled = false;
+        draw();
+      });
+    });
+    draw();
+  }
+
+  window.renderColumnarTable = renderColumnarTable;
+  document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('[data-columnar-table]').forEach(renderColumnarTable);
+  });
+})();
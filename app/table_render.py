@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import math
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+from .metrics import stage_timer
+
+_JSON_ESCAPES = {"<": "\\u003c", ">": "\\u003e", "&": "\\u0026"}
+
+
+def build_table_payload(dataframe: pd.DataFrame, limit: Optional[int] = None) -> Dict[str, Any]:
+    total_rows = len(dataframe)
+    if limit is not None:
+        dataframe = dataframe.head(limit)
+
+    columns: List[str] = []
+    types: List[str] = []
+    data: List[List[Any]] = []
+    # Posicional: nomes repetidos (ex.: SELECT * de um JOIN) devolveriam um DataFrame
+    for index, name in enumerate(dataframe.columns):
+        series = dataframe.iloc[:, index]
+        columns.append(str(name))
+        types.append(_column_type(series))
+        data.append(_column_values(series))
+
+    return {
+        "columns": columns,
+        "types": types,
+        "data": data,
+        "rows": len(dataframe),
+        "total_rows": total_rows,
+    }
+
+
+def dump_table_payload(payload: Dict[str, Any]) -> str:
+    # Seguro para embutir em <script type="application/json">
+    text = json.dumps(
+        payload, ensure_ascii=False, separators=(",", ":"), default=str, allow_nan=False
+    )
+    for char, escaped in _JSON_ESCAPES.items():
+        text = text.replace(char, escaped)
+    return text
+
+
+def render_table_json(dataframe: pd.DataFrame, limit: Optional[int] = None) -> str:
+    with stage_timer("table_json_encode"):
+        return dump_table_payload(build_table_payload(dataframe, limit))
+
+
+def _column_type(series: pd.Series) -> str:
+    if ptypes.is_bool_dtype(series):
+        return "bool"
+    if ptypes.is_integer_dtype(series):
+        return "int"
+    if ptypes.is_numeric_dtype(series):
+        return "float"
+    if ptypes.is_datetime64_any_dtype(series):
+        return "datetime"
+    return "string"
+
+
+def _column_values(series: pd.Series) -> List[Any]:
+    if ptypes.is_datetime64_any_dtype(series):
+        formatted = series.dt.strftime("%Y-%m-%d %H:%M:%S").astype(object)
+        return formatted.where(series.notna(), None).tolist()
+    if ptypes.is_float_dtype(series):
+        # Infinity não é JSON válido: ±inf vira texto, como o pandas exibia antes
+        values = series.astype(object).where(series.notna(), None)
+        infinite = np.isinf(series.to_numpy(dtype=float, na_value=np.nan))
+        if infinite.any():
+            values[infinite] = series[infinite].map(lambda value: "inf" if value > 0 else "-inf")
+        return values.tolist()
+    if ptypes.is_object_dtype(series):
+        # Colunas mistas do SQLite (ex.: 1e999 e texto) também podem trazer ±inf
+        values = series.where(series.notna(), None) if series.hasnans else series
+        return [_finite_or_text(value) for value in values.tolist()]
+    if series.hasnans:
+        return series.astype(object).where(series.notna(), None).tolist()
+    return series.tolist()
+
+
+def _finite_or_text(value: Any) -> Any:
+    if isinstance(value, float) and not math.isfinite(value):
+        if math.isnan(value):
+            return None
+        return "inf" if value > 0 else "-inf"
+    return value
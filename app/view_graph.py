@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, Iterable, List, Set
+
+from .views_store import StoredView
+
+_COMMENT_PATTERN = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_TOKEN_PATTERN = re.compile(
+    r"'(?:[^']|'')*'|\"[^\"]+\"|`[^`]+`|\[[^\]]+\]|[A-Za-z_][\w$]*|\d+|[(),.;]|\S"
+)
+_CTE_PATTERN = re.compile(
+    r"(?:\bWITH(?:\s+RECURSIVE)?|,)\s*([A-Za-z_][\w$]*)\s*(?:\([^)]*\))?\s+AS\s*\(",
+    re.IGNORECASE,
+)
+
+_TABLE_KEYWORDS = {"FROM", "JOIN"}
+_CLAUSE_END_KEYWORDS = {
+    "WHERE",
+    "GROUP",
+    "ORDER",
+    "LIMIT",
+    "HAVING",
+    "UNION",
+    "EXCEPT",
+    "INTERSECT",
+    "WINDOW",
+    "SELECT",
+}
+
+
+def extract_referenced_tables(sql_query: str) -> Set[str]:
+    text = _COMMENT_PATTERN.sub(" ", sql_query or "")
+    tokens = _TOKEN_PATTERN.findall(text)
+    cte_names = {name.lower() for name in _CTE_PATTERN.findall(text)}
+
+    references: Set[str] = set()
+    depth = 0
+    in_from: Dict[int, bool] = {}
+    expect_table = False
+    index = 0
+    while index < len(tokens):
+        token = tokens[index]
+        upper = token.upper()
+        if token == "(":
+            depth += 1
+            expect_table = False
+        elif token == ")":
+            in_from.pop(depth, None)
+            depth = max(depth - 1, 0)
+            expect_table = False
+        elif upper in _TABLE_KEYWORDS:
+            in_from[depth] = True
+            expect_table = True
+        elif upper in _CLAUSE_END_KEYWORDS:
+            in_from[depth] = False
+            expect_table = False
+        elif token == "," and in_from.get(depth):
+            expect_table = True
+        elif expect_table and _is_identifier(token):
+            parts = [_unquote(token)]
+            while index + 2 < len(tokens) and tokens[index + 1] == "." and _is_identifier(tokens[index + 2]):
+                parts.append(_unquote(tokens[index + 2]))
+                index += 2
+            # main.tabela e temp.tabela são as próprias views; outros schemas (ex.: base) ficam qualificados
+            if len(parts) > 1 and parts[0].lower() in {"main", "temp"}:
+                parts = parts[1:]
+            name = ".".join(parts)
+            if name.lower() not in cte_names:
+                references.add(name)
+            expect_table = False
+        index += 1
+    return references
+
+
+def build_dependency_graph(views: Iterable[StoredView]) -> Dict[str, Set[str]]:
+    views = list(views)
+    view_names = {stored.name.lower(): stored.name for stored in views}
+    upstream: Dict[str, Set[str]] = {}
+    for stored in views:
+        parents: Set[str] = set()
+        if stored.source == "views":
+            for table in extract_referenced_tables(stored.query):
+                parent = view_names.get(table.lower())
+                if parent is not None and parent != stored.name:
+                    parents.add(parent)
+        upstream[stored.name] = parents
+    return upstream
+
+
+def downstream_views(views: Iterable[StoredView], view_name: str) -> List[str]:
+    upstream = build_dependency_graph(views)
+    children: Dict[str, Set[str]] = {name: set() for name in upstream}
+    for name, parents in upstream.items():
+        for parent in parents:
+            children.setdefault(parent, set()).add(name)
+
+    reachable: Set[str] = set()
+    pending = [view_name]
+    while pending:
+        current = pending.pop()
+        for child in children.get(current, ()):
+            if child not in reachable and child != view_name:
+                reachable.add(child)
+                pending.append(child)
+
+    # Ordenação topológica restrita ao subgrafo afetado (Kahn)
+    in_degree = {
+        name: len(upstream[name] & reachable) for name in reachable
+    }
+    ready = sorted(name for name, degree in in_degree.items() if degree == 0)
+    ordered: List[str] = []
+    while ready:
+        current = ready.pop(0)
+        ordered.append(current)
+        for child in sorted(children.get(current, ())):
+            if child in in_degree:
+                in_degree[child] -= 1
+                if in_degree[child] == 0:
+                    ready.append(child)
+    return ordered
+
+
+def _is_identifier(token: str) -> bool:
+    return bool(token) and (token[0].isalpha() or token[0] in "_\"`[")
+
+
+def _unquote(token: str) -> str:
+    if len(token) >= 2 and token[0] in "\"`[":
+        return token[1:-1]
+    return token
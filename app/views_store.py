@@ -1,8 +1,9 @@
 from __future__ import annotations
 
 import datetime as dt
+import itertools
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, Optional
+from typing import Dict, List, Optional
 
 import pandas as pd
 
@@ -12,6 +13,8 @@ class StoredView:
     name: str
     query: str
     dataframe: pd.DataFrame
+    source: str = "database"
+    version: int = 0
     created_at: dt.datetime = field(default_factory=dt.datetime.utcnow)
     updated_at: dt.datetime = field(default_factory=dt.datetime.utcnow)
 
@@ -19,15 +22,17 @@ class StoredView:
 class ViewStore:
     def __init__(self) -> None:
         self._views: Dict[str, StoredView] = {}
+        self._versions = itertools.count(1)
 
-    def list(self) -> Iterable[StoredView]:
-        return self._views.values()
+    def list(self) -> List[StoredView]:
+        return list(self._views.values())
 
     def get(self, name: str) -> Optional[StoredView]:
         return self._views.get(name)
 
-    def save(self, name: str, query: str, dataframe: pd.DataFrame) -> StoredView:
-        stored = StoredView(name=name, query=query, dataframe=dataframe.copy())
+    def save(self, name: str, query: str, dataframe: pd.DataFrame, source: str = "database") -> StoredView:
+        stored = StoredView(name=name, query=query, dataframe=dataframe.copy(), source=source)
+        stored.version = next(self._versions)
         stored.updated_at = stored.created_at
         self._views[name] = stored
         return stored
@@ -38,6 +43,7 @@ class ViewStore:
         stored = self._views[name]
         stored.query = query
         stored.dataframe = dataframe.copy()
+        stored.version = next(self._versions)
         stored.updated_at = dt.datetime.utcnow()
         return stored
 
@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import multiprocessing
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+
+from app.database import init_database
+from app.rollups import rollup_store
+from app.routes import (
+    apply_filters,
+    build_visualization,
+    execute_on_views,
+    execute_sql_query,
+    find_duplicates,
+)
+from app.views_store import view_store
+
+DEFAULT_SIZES = "10000,1000000,10000000"
+DEFAULT_VIEW_COUNTS = "1,5,20"
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_SEED = 20240101
+
+FILTERS_TEXT = "status = 'Delayed'\npassengers >= 120\norigin contains G"
+PIE_COLUMNS = {"names": "airline", "values": "passengers", "table_columns": None}
+TABLE_COLUMNS = {"names": None, "values": None, "table_columns": "airline, origin, destination, departure"}
+DUPLICATE_COLUMNS = ["airline", "origin", "destination", "departure"]
+
+
+@dataclass
+class Measurement:
+    seconds: float
+    peak_bytes: int
+
+
+def measure(
+    function: Callable[[], object], repeat: int, warmup: bool = True, single_run: bool = False
+) -> Measurement:
+    if single_run:
+        return measure_in_child(function)
+
+    if warmup:
+        function()
+    timings: List[float] = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+
+    # O tracemalloc distorce o tempo, então a memória é medida numa execução separada
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return Measurement(seconds=statistics.median(timings), peak_bytes=peak)
+
+
+def measure_in_child(function: Callable[[], object]) -> Measurement:
+    # Execução cara demais para repetir e lenta demais sob tracemalloc: roda uma vez num
+    # processo filho, sem rastreamento, e o pico de memória vem do RSS máximo do filho
+    context = multiprocessing.get_context("fork")
+    receiver, sender = context.Pipe(duplex=False)
+
+    def target() -> None:
+        gc.collect()
+        rss_before = _max_rss_bytes()
+        started = time.perf_counter()
+        function()
+        seconds = time.perf_counter() - started
+        sender.send((seconds, max(_max_rss_bytes() - rss_before, 0)))
+
+    process = context.Process(target=target)
+    process.start()
+    process.join()
+    if process.exitcode != 0 or not receiver.poll():
+        raise RuntimeError(f"Medição no processo filho falhou (código {process.exitcode}).")
+    seconds, peak = receiver.recv()
+    return Measurement(seconds=seconds, peak_bytes=peak)
+
+
+def _max_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss é em KiB no Linux e em bytes no macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_suite(
+    sizes: List[int], view_counts: List[int], repeat: int, data_dir: str, seed: int = DEFAULT_SEED
+) -> Dict[str, Measurement]:
+    results: Dict[str, Measurement] = {}
+
+    def record(
+        name: str, function: Callable[[], object], times: int = repeat, single_run: bool = False
+    ) -> None:
+        measurement = measure(function, times, single_run=single_run)
+        results[name] = measurement
+        print(
+            f"{name:<55} {measurement.seconds * 1000:>12.2f} ms {measurement.peak_bytes / 2**20:>10.1f} MiB",
+            flush=True,
+        )
+
+    for rows in sizes:
+        database_path = os.path.join(data_dir, f"flights_{rows}.sqlite")
+
+        def create_database() -> None:
+            if os.path.exists(database_path):
+                os.remove(database_path)
+            # Mesma semente a cada execução: a baseline compara sempre os mesmos dados
+            random.seed(seed)
+            init_database(database_path, rows=rows)
+
+        record(f"init_database[rows={rows}]", create_database, single_run=True)
+
+        view_store.clear()
+        rollup_store.clear()
+        base_query = "SELECT * FROM flights"
+        view_store.save("bench_flights", base_query, execute_sql_query(database_path, base_query))
+        dataframe = view_store.get("bench_flights").dataframe
+
+        record(f"apply_filters[rows={rows}]", lambda: apply_filters(dataframe, FILTERS_TEXT))
+        record(
+            f"build_visualization.pie[rows={rows}]",
+            lambda: build_visualization("bench_flights", "pie", PIE_COLUMNS, FILTERS_TEXT),
+        )
+        record(
+            f"build_visualization.table[rows={rows}]",
+            lambda: build_visualization("bench_flights", "table", TABLE_COLUMNS, FILTERS_TEXT),
+        )
+        rollup_store.refresh_table(database_path, "flights", view_store.get("bench_flights").version)
+        record(
+            f"build_visualization.pie_rollup[rows={rows}]",
+            lambda: build_visualization("bench_flights", "pie", PIE_COLUMNS, "status = 'Delayed'"),
+        )
+        rollup_store.clear()
+        record(f"duplicates[rows={rows}]", lambda: find_duplicates(dataframe, DUPLICATE_COLUMNS))
+
+        for view_count in view_counts:
+            view_store.clear()
+            # As views particionam a tabela: o total de linhas é o mesmo para qualquer contagem
+            for index in range(view_count):
+                query = f"{base_query} WHERE flight_id % {view_count} = {index}"
+                view_store.save(f"bench_view_{index}", query, execute_sql_query(database_path, query))
+            # Só as views citadas são carregadas: a consulta precisa referenciar todas
+            union_query = " UNION ALL ".join(
+                f"SELECT airline FROM bench_view_{index}" for index in range(view_count)
+            )
+            record(
+                f"execute_on_views[rows={rows},views={view_count}]",
+                lambda: execute_on_views(
+                    f"SELECT airline, COUNT(*) AS total FROM ({union_query}) GROUP BY airline"
+                ),
+            )
+
+        view_store.clear()
+        small_query = f"{base_query} WHERE status = 'Cancelled' LIMIT 1000"
+        view_store.save("bench_small", small_query, execute_sql_query(database_path, small_query))
+        record(
+            f"execute_on_views.base_join[rows={rows}]",
+            lambda: execute_on_views(
+                "SELECT s.flight_id, f.aircraft FROM bench_small s "
+                "JOIN base.flights f ON f.flight_id = s.flight_id",
+                database_path=database_path,
+            ),
+        )
+
+        view_store.clear()
+        del dataframe
+        gc.collect()
+    return results
+
+
+def compare(
+    results: Dict[str, Measurement],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+    memory_threshold: float,
+) -> List[str]:
+    regressions: List[str] = []
+    for name, measurement in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        time_limit = reference["seconds"] * (1 + threshold)
+        if measurement.seconds > time_limit:
+            regressions.append(
+                f"{name}: tempo {measurement.seconds:.4f}s > {time_limit:.4f}s "
+                f"(baseline {reference['seconds']:.4f}s)"
+            )
+        memory_limit = reference["peak_bytes"] * (1 + memory_threshold)
+        if measurement.peak_bytes > memory_limit:
+            regressions.append(
+                f"{name}: memória {measurement.peak_bytes} B > {int(memory_limit)} B "
+                f"(baseline {reference['peak_bytes']} B)"
+            )
+    return regressions
+
+
+def _parse_ints(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmarks dos caminhos críticos sobre bancos flights gerados localmente."
+    )
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="Quantidades de linhas, separadas por vírgula.")
+    parser.add_argument("--view-counts", default=DEFAULT_VIEW_COUNTS, help="Quantidades de views para execute_on_views.")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por medição (usa a mediana).")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Arquivo JSON com a baseline.")
+    parser.add_argument("--save-baseline", action="store_true", help="Grava os resultados como nova baseline.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Regressão de tempo tolerada (0.2 = 20%%).")
+    parser.add_argument("--memory-threshold", type=float, default=None, help="Regressão de memória tolerada (padrão: --threshold).")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Semente dos dados gerados.")
+    parser.add_argument("--data-dir", default=None, help="Diretório para os bancos gerados (padrão: temporário).")
+    args = parser.parse_args(argv)
+
+    memory_threshold = args.threshold if args.memory_threshold is None else args.memory_threshold
+    with tempfile.TemporaryDirectory() as temporary_dir:
+        data_dir = args.data_dir or temporary_dir
+        os.makedirs(data_dir, exist_ok=True)
+        results = run_suite(
+            _parse_ints(args.sizes),
+            _parse_ints(args.view_counts),
+            max(args.repeat, 1),
+            data_dir,
+            args.seed,
+        )
+
+    serialized = {name: asdict(measurement) for name, measurement in results.items()}
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as handle:
+            json.dump(serialized, handle, indent=2, sort_keys=True)
+        print(f"Baseline gravada em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"Nenhuma baseline em {args.baseline}; use --save-baseline para criá-la.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as handle:
+        baseline = json.load(handle)
+    regressions = compare(results, baseline, args.threshold, memory_threshold)
+    if regressions:
+        print("Regressões detectadas:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    print("Nenhuma regressão acima do limite configurado.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
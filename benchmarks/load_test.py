@@ -0,0 +1,323 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import resource
+import sys
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+AIRLINES = ["Azul", "Gol", "LATAM", "Passaredo", "Itapemirim", "Voepass"]
+_DASHBOARD_ITEM_PATTERN = r"{name}</h2>.*?/dashboard/([0-9a-f]+)/edit"
+
+
+@dataclass
+class Sample:
+    route: str
+    seconds: float
+    status: int
+
+
+@dataclass
+class RouteReport:
+    route: str
+    count: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+@dataclass
+class LoadReport:
+    duration: float
+    routes: List[RouteReport]
+    rss_start_mib: float
+    rss_end_mib: float
+    rss_peak_mib: float
+    rss_growth_mib: float
+    rss_slope_mib_per_min: float
+    rss_samples: List[Tuple[float, float]] = field(default_factory=list)
+
+
+class InProcessClient:
+    def __init__(self) -> None:
+        from app import app
+
+        self._client = app.test_client()
+
+    def request(self, method: str, path: str, data: Optional[Dict[str, object]] = None) -> Tuple[int, str]:
+        response = self._client.open(path, method=method, data=data)
+        return response.status_code, response.get_data(as_text=True)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class HttpClient:
+    def __init__(self, base_url: str) -> None:
+        self._base_url = base_url.rstrip("/")
+        self._opener = urllib.request.build_opener(_NoRedirect)
+
+    def request(self, method: str, path: str, data: Optional[Dict[str, object]] = None) -> Tuple[int, str]:
+        body = urllib.parse.urlencode(data or {}, doseq=True).encode() if method == "POST" else None
+        request = urllib.request.Request(self._base_url + path, data=body, method=method)
+        try:
+            with self._opener.open(request) as response:
+                return response.status, response.read().decode("utf-8", "replace")
+        except urllib.error.HTTPError as exc:
+            return exc.code, exc.read().decode("utf-8", "replace")
+
+
+class Recorder:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.samples: List[Sample] = []
+
+    def call(self, client, route: str, method: str, path: str, data: Optional[Dict[str, object]] = None) -> str:
+        started = time.perf_counter()
+        try:
+            status, body = client.request(method, path, data)
+        except Exception:
+            status, body = 599, ""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples.append(Sample(route=route, seconds=elapsed, status=status))
+        return body
+
+
+def run_session(client, recorder: Recorder, session_id: int, iteration: int) -> None:
+    view_name = f"load_{session_id}_{iteration}"
+    airline = AIRLINES[(session_id + iteration) % len(AIRLINES)]
+    recorder.call(
+        client,
+        "POST /views",
+        "POST",
+        "/views",
+        {
+            "view_name": view_name,
+            "query_source": "query",
+            "sql_query": f"SELECT * FROM flights WHERE airline = '{airline}'",
+        },
+    )
+    recorder.call(client, "POST /views/<name>/refresh", "POST", f"/views/{view_name}/refresh")
+    sandbox_query = f"SELECT origin, COUNT(*) AS total FROM {view_name} GROUP BY origin"
+    recorder.call(client, "POST /sandbox (amostra)", "POST", "/sandbox", {"sql_query": sandbox_query, "action": "run"})
+    recorder.call(client, "POST /sandbox (completo)", "POST", "/sandbox", {"sql_query": sandbox_query, "action": "run_full"})
+    recorder.call(
+        client,
+        "POST /duplicates",
+        "POST",
+        "/duplicates",
+        {"view_name": view_name, "columns": ["origin", "destination", "departure"]},
+    )
+    recorder.call(
+        client,
+        "POST /dashboard (add)",
+        "POST",
+        "/dashboard",
+        {
+            "action": "add",
+            "view_name": view_name,
+            "viz_type": "pie",
+            "viz_name": view_name,
+            "names_column": "status",
+            "value_column": "passengers",
+        },
+    )
+    page = recorder.call(client, "GET /dashboard", "GET", "/dashboard")
+
+    # Remove o que a sessão criou para que o crescimento de RSS reflita vazamentos reais
+    match = re.search(_DASHBOARD_ITEM_PATTERN.format(name=re.escape(view_name)), page, re.DOTALL)
+    if match:
+        recorder.call(client, "POST /dashboard/<id>/delete", "POST", f"/dashboard/{match.group(1)}/delete")
+    recorder.call(client, "POST /views/<name>/delete", "POST", f"/views/{view_name}/delete")
+
+
+def read_rss_mib(pid: Optional[int] = None) -> float:
+    status_path = f"/proc/{pid or 'self'}/status"
+    try:
+        with open(status_path, encoding="utf-8") as handle:
+            for line in handle:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    if pid is None:
+        # Sem /proc: usa o pico do processo (em KiB no Linux, bytes no macOS)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    return float("nan")
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    rank = max(math.ceil(percent / 100 * len(ordered)) - 1, 0)
+    return ordered[rank]
+
+
+def _slope(points: Sequence[Tuple[float, float]]) -> float:
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if denominator == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+def run_load(
+    make_client,
+    sessions: int,
+    iterations: Optional[int],
+    duration: Optional[float],
+    sample_interval: float,
+    server_pid: Optional[int],
+) -> LoadReport:
+    recorder = Recorder()
+    rss_samples: List[Tuple[float, float]] = []
+    stop = threading.Event()
+    started = time.perf_counter()
+
+    def sample_rss() -> None:
+        while True:
+            rss_samples.append((time.perf_counter() - started, read_rss_mib(server_pid)))
+            if stop.wait(sample_interval):
+                break
+        rss_samples.append((time.perf_counter() - started, read_rss_mib(server_pid)))
+
+    def worker(session_id: int) -> None:
+        client = make_client()
+        iteration = 0
+        while True:
+            if iterations is not None and iteration >= iterations:
+                break
+            if duration is not None and time.perf_counter() - started >= duration:
+                break
+            run_session(client, recorder, session_id, iteration)
+            iteration += 1
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        list(executor.map(worker, range(sessions)))
+    stop.set()
+    sampler.join()
+    elapsed = time.perf_counter() - started
+
+    grouped: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in recorder.samples:
+        grouped[sample.route].append(sample)
+    routes = []
+    for route, samples in grouped.items():
+        latencies = [sample.seconds * 1000 for sample in samples]
+        routes.append(
+            RouteReport(
+                route=route,
+                count=len(samples),
+                errors=sum(1 for sample in samples if sample.status >= 500),
+                throughput=len(samples) / elapsed if elapsed else 0.0,
+                p50_ms=percentile(latencies, 50),
+                p95_ms=percentile(latencies, 95),
+                p99_ms=percentile(latencies, 99),
+            )
+        )
+
+    rss_values = [value for _, value in rss_samples]
+    # Ignora o primeiro quarto da execução (aquecimento) ao estimar a tendência
+    steady = [point for point in rss_samples if point[0] >= elapsed / 4]
+    return LoadReport(
+        duration=elapsed,
+        routes=routes,
+        rss_start_mib=rss_values[0],
+        rss_end_mib=rss_values[-1],
+        rss_peak_mib=max(rss_values),
+        rss_growth_mib=rss_values[-1] - rss_values[0],
+        rss_slope_mib_per_min=_slope(steady) * 60,
+        rss_samples=rss_samples,
+    )
+
+
+def print_report(report: LoadReport) -> None:
+    print(f"Duração: {report.duration:.1f}s")
+    header = f"{'Rota':<32} {'Req':>7} {'Erros':>6} {'Req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for route in report.routes:
+        print(
+            f"{route.route:<32} {route.count:>7} {route.errors:>6} {route.throughput:>8.2f} "
+            f"{route.p50_ms:>9.1f} {route.p95_ms:>9.1f} {route.p99_ms:>9.1f}"
+        )
+    print(
+        f"RSS: início {report.rss_start_mib:.1f} MiB, fim {report.rss_end_mib:.1f} MiB, "
+        f"pico {report.rss_peak_mib:.1f} MiB, crescimento {report.rss_growth_mib:+.1f} MiB, "
+        f"tendência {report.rss_slope_mib_per_min:+.2f} MiB/min"
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Teste de carga e soak com sessões concorrentes de analistas."
+    )
+    parser.add_argument("--sessions", type=int, default=8, help="Sessões concorrentes.")
+    parser.add_argument("--iterations", type=int, default=None, help="Roteiros por sessão (padrão: 5 sem --duration).")
+    parser.add_argument("--duration", type=float, default=None, help="Duração do soak em segundos.")
+    parser.add_argument("--base-url", default=None, help="Servidor local (ex.: http://127.0.0.1:5000). Sem ele, usa o test client do Flask.")
+    parser.add_argument("--server-pid", type=int, default=None, help="PID do servidor para medir RSS quando --base-url é usado.")
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Intervalo de amostragem do RSS em segundos.")
+    parser.add_argument("--max-rss-growth", type=float, default=None, help="Falha se o RSS crescer mais que este valor (MiB).")
+    parser.add_argument("--output", default=None, help="Grava o relatório completo em JSON.")
+    args = parser.parse_args(argv)
+
+    iterations = args.iterations
+    if iterations is None and args.duration is None:
+        iterations = 5
+
+    if args.base_url:
+        base_url = args.base_url
+        server_pid = args.server_pid
+
+        def make_client() -> HttpClient:
+            return HttpClient(base_url)
+    else:
+        # Cria a aplicação antes da primeira amostra de RSS
+        InProcessClient()
+        server_pid = None
+        make_client = InProcessClient
+
+    report = run_load(
+        make_client, max(args.sessions, 1), iterations, args.duration, args.sample_interval, server_pid
+    )
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            json.dump(asdict(report), handle, indent=2)
+
+    failed = False
+    if any(route.errors for route in report.routes):
+        print("Falha: respostas com erro 5xx.")
+        failed = True
+    if args.max_rss_growth is not None and report.rss_growth_mib > args.max_rss_growth:
+        print(f"Falha: RSS cresceu {report.rss_growth_mib:.1f} MiB (limite {args.max_rss_growth} MiB).")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
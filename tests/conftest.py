@@ -0,0 +1,26 @@
+import pytest
+
+from app import app as flask_app
+from app.dashboard_store import dashboard_store
+from app.rollups import rollup_store
+from app.sampling import sample_store
+from app.views_store import view_store
+
+
+@pytest.fixture(autouse=True)
+def clean_stores():
+    view_store.clear()
+    dashboard_store.clear()
+    sample_store.clear()
+    rollup_store.clear()
+    yield
+
+
+@pytest.fixture
+def app():
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
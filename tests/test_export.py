@@ -0,0 +1,87 @@
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from app.export import iter_dataframe_chunks, iter_export
+from app.views_store import view_store
+
+
+def read_parquet(payload):
+    return pq.read_table(io.BytesIO(payload)).to_pandas()
+
+
+def test_iter_dataframe_chunks_splits_rows():
+    frame = pd.DataFrame({"a": range(7)})
+
+    assert [len(chunk) for chunk in iter_dataframe_chunks(frame, 3)] == [3, 3, 1]
+
+
+def test_csv_export_writes_header_once():
+    frame = pd.DataFrame({"a": range(4), "b": list("wxyz")})
+    payload = b"".join(iter_export(iter_dataframe_chunks(frame, 3), "csv"))
+
+    assert payload.decode("utf-8").splitlines() == ["a,b", "0,w", "1,x", "2,y", "3,z"]
+
+
+def test_parquet_export_widens_null_columns_from_first_chunk():
+    # Como em iter_on_views: cada bloco infere seus tipos a partir das tuplas do cursor
+    rows = [(index, None if index < 4 else "A1", None) for index in range(10)]
+    chunks = (
+        pd.DataFrame.from_records(rows[start : start + 3], columns=["flight_id", "gate", "delay"])
+        for start in range(0, len(rows), 3)
+    )
+
+    actual = read_parquet(b"".join(iter_export(chunks, "parquet")))
+
+    assert actual["flight_id"].tolist() == list(range(10))
+    assert actual["gate"].isna().tolist() == [True] * 4 + [False] * 6
+    assert actual["gate"].dropna().tolist() == ["A1"] * 6
+    assert actual["delay"].isna().all()
+
+
+def test_parquet_export_renames_repeated_columns():
+    frame = pd.DataFrame([[1, 2, 3]], columns=["id", "id", "id_2"])
+
+    actual = read_parquet(b"".join(iter_export(iter_dataframe_chunks(frame, 10), "parquet")))
+
+    assert list(actual.columns) == ["id", "id_2", "id_2_2"]
+
+
+def test_sandbox_parquet_export_of_join_with_base(client, app, monkeypatch):
+    monkeypatch.setitem(app.config, "EXPORT_CHUNK_ROWS", 3)
+    view_store.save("a", "SELECT 1", pd.DataFrame({"flight_id": [1, 2, 3, 4], "note": [None, None, None, "x"]}))
+
+    response = client.post(
+        "/sandbox/export",
+        data={
+            "sql_query": "SELECT * FROM a JOIN base.flights f ON f.flight_id = a.flight_id",
+            "export_format": "parquet",
+        },
+    )
+
+    assert response.status_code == 200
+    actual = read_parquet(response.data)
+    assert len(actual) == 4
+    assert actual["note"].tolist()[-1] == "x"
+
+
+def test_sandbox_export_reports_query_errors_on_page(client):
+    response = client.post(
+        "/sandbox/export", data={"sql_query": "SELECT * FROM nao_existe", "export_format": "parquet"}
+    )
+
+    assert response.status_code == 200
+    assert response.mimetype == "text/html"
+    assert "Erro ao exportar a consulta" in response.get_data(as_text=True)
+
+
+def test_view_export_quotes_non_ascii_filenames(client):
+    view_store.save("航班 \"x\"", "SELECT 1", pd.DataFrame({"a": [1]}))
+
+    response = client.get("/views/航班 \"x\"/export.csv")
+
+    disposition = response.headers["Content-Disposition"]
+    assert disposition.startswith("attachment; ")
+    assert "filename*=UTF-8''%E8%88%AA%E7%8F%AD%20%22x%22.csv" in disposition
+    assert response.data == b"a\n1\n"
@@ -0,0 +1,117 @@
+import base64
+import json
+import math
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.database import init_database
+from app.rollups import COUNT_COLUMN, aggregate_dataframe, build_cuboids, rollup_store
+from app.routes import build_visualization, execute_sql_query
+from app.views_store import view_store
+
+PIE_COLUMNS = {"names": "airline", "values": "passengers", "table_columns": None}
+
+
+def pie_totals(result):
+    trace = json.loads(result["graph_json"])["data"][0]
+    values = trace["values"]
+    if isinstance(values, dict):
+        # Plotly serializa arrays numéricos como {"dtype", "bdata"}
+        values = np.frombuffer(base64.b64decode(values["bdata"]), dtype=values["dtype"]).tolist()
+    totals = {}
+    for label, value in zip(trace["labels"], values):
+        totals[label] = totals.get(label, 0) + value
+    return totals
+
+
+@pytest.fixture
+def database_path(tmp_path):
+    path = str(tmp_path / "flights.sqlite")
+    init_database(path, rows=500)
+    return path
+
+
+def save_flights_view(database_path, name="fl"):
+    query = "SELECT * FROM flights"
+    return view_store.save(name, query, execute_sql_query(database_path, query))
+
+
+def raw_pie(stored, filters_text):
+    enabled = rollup_store._table_rollups.pop("flights", None)
+    try:
+        return pie_totals(build_visualization(stored.name, "pie", PIE_COLUMNS, filters_text))
+    finally:
+        if enabled is not None:
+            rollup_store._table_rollups["flights"] = enabled
+
+
+def test_cuboids_keep_counts_and_sums():
+    frame = pd.DataFrame(
+        {
+            "airline": ["Gol", "Gol", "Azul", "Azul"],
+            "status": ["On Time", "Delayed", "On Time", "On Time"],
+            "passengers": [10, 20, 30, 40],
+        }
+    )
+    base = aggregate_dataframe(frame, ["airline", "status"], ["passengers"])
+    cuboids = build_cuboids(base, ["airline", "status"], ["passengers"])
+
+    by_airline = cuboids[frozenset({"airline"})].set_index("airline")
+    assert by_airline.loc["Gol", "passengers"] == 30
+    assert by_airline.loc["Azul", COUNT_COLUMN] == 2
+    assert cuboids[frozenset({"status"})][COUNT_COLUMN].sum() == 4
+
+
+@pytest.mark.parametrize("filters_text", ["", "status = 'Delayed'", "origin != 'GRU'"])
+def test_rollup_pie_matches_raw_pie(database_path, filters_text):
+    stored = save_flights_view(database_path)
+    rollup_store.refresh_table(database_path, "flights", stored.version)
+    assert rollup_store.for_view(stored) is not None
+
+    from_rollup = pie_totals(build_visualization("fl", "pie", PIE_COLUMNS, filters_text))
+    expected = raw_pie(stored, filters_text)
+
+    assert from_rollup.keys() == expected.keys()
+    assert all(math.isclose(from_rollup[label], expected[label]) for label in expected)
+
+
+def test_table_rollup_is_skipped_for_views_read_from_other_data(database_path):
+    rollup_store.refresh_table(database_path, "flights")
+    stored = save_flights_view(database_path)
+
+    assert rollup_store.for_view(stored) is None
+
+
+def test_table_rollup_is_reused_while_database_file_is_unchanged(database_path):
+    first = rollup_store.refresh_table(database_path, "flights", save_flights_view(database_path, "a").version)
+    second_view = save_flights_view(database_path, "b")
+
+    assert rollup_store.refresh_table(database_path, "flights", second_view.version) is first
+    assert rollup_store.for_view(view_store.get("a")) is first
+    assert rollup_store.for_view(second_view) is first
+
+
+def test_table_rollup_follows_database_changes(database_path):
+    rollup_store.refresh_table(database_path, "flights")
+    stored = save_flights_view(database_path)
+    rollup_store.refresh_source_table(database_path, stored)
+
+    connection = sqlite3.connect(database_path)
+    connection.execute("UPDATE flights SET passengers = 0 WHERE airline = 'Gol'")
+    connection.commit()
+    connection.close()
+    stat = os.stat(database_path)
+    os.utime(database_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    stale = view_store.get("fl")
+    assert rollup_store.for_view(stale) is not None
+    stored = view_store.update("fl", stale.query, execute_sql_query(database_path, stale.query))
+    assert rollup_store.for_view(stored) is None
+
+    rollup_store.refresh_source_table(database_path, stored)
+    assert rollup_store.for_view(stored) is not None
+    assert pie_totals(build_visualization("fl", "pie", PIE_COLUMNS, ""))["Gol"] == 0
@@ -0,0 +1,60 @@
+import pandas as pd
+
+from app.sampling import reservoir_sample_indices, sample_store
+from app.views_store import view_store
+
+
+def test_reservoir_sample_indices_are_unique_and_in_range():
+    indices = reservoir_sample_indices(100_000, 500, seed=7)
+
+    assert len(indices) == 500
+    assert len(set(indices)) == 500
+    assert all(0 <= index < 100_000 for index in indices)
+
+
+def test_reservoir_sample_indices_are_reproducible_per_seed():
+    assert reservoir_sample_indices(10_000, 50, seed=1) == reservoir_sample_indices(10_000, 50, seed=1)
+    assert reservoir_sample_indices(10_000, 50, seed=1) != reservoir_sample_indices(10_000, 50, seed=2)
+
+
+def test_reservoir_sample_indices_cover_the_whole_range():
+    indices = reservoir_sample_indices(100_000, 2_000, seed=3)
+
+    assert 45_000 < sum(indices) / len(indices) < 55_000
+    assert sum(index >= 90_000 for index in indices) > 100
+
+
+def test_reservoir_sample_indices_small_inputs():
+    assert reservoir_sample_indices(5, 10, seed=0) == [0, 1, 2, 3, 4]
+    assert reservoir_sample_indices(5, 0, seed=0) == []
+
+
+def test_sample_store_reuses_sample_until_view_changes():
+    stored = view_store.save("v", "SELECT 1", pd.DataFrame({"a": range(1_000)}))
+
+    first = sample_store.get(stored, 100, seed=0)
+    assert len(first) == 100
+    assert sample_store.get(stored, 100, seed=0) is first
+
+    stored = view_store.update("v", "SELECT 1", pd.DataFrame({"a": range(2_000)}))
+    assert sample_store.get(stored, 100, seed=0) is not first
+
+
+def test_sample_store_returns_small_views_unchanged():
+    stored = view_store.save("v", "SELECT 1", pd.DataFrame({"a": range(10)}))
+
+    assert sample_store.get(stored, 100, seed=0) is stored.dataframe
+
+
+def test_rename_discards_cached_sample(client, app, monkeypatch):
+    monkeypatch.setitem(app.config, "PREVIEW_SAMPLE_SIZE", 100)
+    client.post("/views", data={"view_name": "s", "query_source": "table", "table_name": "flights"})
+    client.post("/sandbox", data={"sql_query": "SELECT * FROM s", "action": "run"})
+    assert "s" in sample_store._samples
+
+    client.post(
+        "/views",
+        data={"original_name": "s", "view_name": "s2", "query_source": "table", "table_name": "flights"},
+    )
+
+    assert "s" not in sample_store._samples
@@ -0,0 +1,65 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.table_render import build_table_payload, dump_table_payload, render_table_json
+
+
+def test_payload_is_columnar_and_limited():
+    frame = pd.DataFrame({"id": [1, 2, 3], "nome": ["a", "b", "c"]})
+
+    payload = build_table_payload(frame, limit=2)
+
+    assert payload["columns"] == ["id", "nome"]
+    assert payload["types"] == ["int", "string"]
+    assert payload["data"] == [[1, 2], ["a", "b"]]
+    assert (payload["rows"], payload["total_rows"]) == (2, 3)
+
+
+def test_payload_keeps_repeated_column_names():
+    frame = pd.DataFrame([[1, "x", 1]], columns=["id", "nome", "id"])
+
+    payload = build_table_payload(frame)
+
+    assert payload["columns"] == ["id", "nome", "id"]
+    assert payload["data"] == [[1], ["x"], [1]]
+
+
+def test_non_finite_values_become_valid_json():
+    frame = pd.DataFrame(
+        {
+            "real": [1.5, np.inf, np.nan],
+            "misto": pd.Series([-np.inf, "n/a", None], dtype=object),
+            "quando": pd.to_datetime(["2024-01-01", None, "2024-01-02"]),
+        }
+    )
+
+    payload = json.loads(render_table_json(frame))
+
+    assert payload["data"] == [
+        [1.5, "inf", None],
+        ["-inf", "n/a", None],
+        ["2024-01-01 00:00:00", None, "2024-01-02 00:00:00"],
+    ]
+
+
+def test_dump_escapes_html_sensitive_characters():
+    text = dump_table_payload({"data": [["</script><b>&"]]})
+
+    assert "<" not in text and ">" not in text and "&" not in text
+    assert json.loads(text) == {"data": [["</script><b>&"]]}
+
+
+def test_sandbox_renders_join_with_repeated_columns_and_infinity(client):
+    for action in ("run", "run_full"):
+        response = client.post(
+            "/sandbox",
+            data={
+                "sql_query": "SELECT * FROM (SELECT 1 AS id, 1e999 AS v UNION ALL SELECT 2, 'n/a') a "
+                "JOIN (SELECT 1 AS id) b ON a.id = b.id",
+                "action": action,
+            },
+        )
+        assert response.status_code == 200
+        assert "Erro" not in response.get_data(as_text=True)
@@ -0,0 +1,71 @@
+import pandas as pd
+
+from app.dashboard_store import dashboard_store
+from app.routes import refresh_dependents
+from app.view_graph import downstream_views, extract_referenced_tables
+from app.views_store import view_store
+
+
+def test_extract_referenced_tables_reads_from_and_join():
+    sql = """
+        SELECT a.*, b.total
+        FROM voos a
+        JOIN resumo AS b ON a.id = b.id
+        LEFT JOIN (SELECT * FROM extra) e USING (id)
+        WHERE a.id IN (SELECT id FROM filtro)
+    """
+    assert extract_referenced_tables(sql) == {"voos", "resumo", "extra", "filtro"}
+
+
+def test_extract_referenced_tables_ignores_ctes_comments_and_strings():
+    sql = """
+        -- FROM comentario
+        WITH base_cte AS (SELECT * FROM origem)
+        SELECT 'FROM texto' FROM base_cte, "outra view" /* JOIN bloco */
+    """
+    assert extract_referenced_tables(sql) == {"origem", "outra view"}
+
+
+def test_extract_referenced_tables_keeps_foreign_schemas_qualified():
+    sql = "SELECT * FROM main.voos JOIN base.flights USING (flight_id)"
+    assert extract_referenced_tables(sql) == {"voos", "base.flights"}
+
+
+def test_downstream_views_are_topologically_ordered():
+    frame = pd.DataFrame({"a": [1]})
+    view_store.save("p", "SELECT * FROM flights", frame)
+    view_store.save("c", "SELECT * FROM b JOIN p", frame, source="views")
+    view_store.save("b", "SELECT * FROM p", frame, source="views")
+    view_store.save("solta", "SELECT * FROM p", frame)
+
+    assert downstream_views(view_store.list(), "p") == ["b", "c"]
+
+
+def test_refresh_dependents_skips_descendants_of_failed_views():
+    view_store.save("p", "SELECT * FROM flights", pd.DataFrame({"b": [1]}))
+    view_store.save("d1", "SELECT a FROM p", pd.DataFrame({"a": [0]}), source="views")
+    view_store.save("d2", "SELECT * FROM d1", pd.DataFrame({"a": [0]}), source="views")
+    view_store.save("ok", "SELECT b * 2 AS b FROM p", pd.DataFrame({"b": [0]}), source="views")
+    item = dashboard_store.add("d2", "d2", "table", {}, "", {"stale": "sim"})
+
+    refreshed, failed = refresh_dependents(None, "p", max_workers=1)
+
+    assert refreshed == ["p", "ok"]
+    assert set(failed) == {"d1", "d2"}
+    assert "no such column" in failed["d1"]
+    assert failed["d2"] == "depende de d1"
+    assert view_store.get("ok").dataframe["b"].tolist() == [2]
+    assert view_store.get("d2").dataframe["a"].tolist() == [0]
+    assert dashboard_store.get(item.id).rendered == {"stale": "sim"}
+
+
+def test_refresh_route_reports_failed_dependents(client):
+    client.post(
+        "/views",
+        data={"view_name": "p", "query_source": "query", "sql_query": "SELECT flight_id FROM flights"},
+    )
+    view_store.save("d", "SELECT airline FROM p", pd.DataFrame({"airline": []}), source="views")
+
+    response = client.post("/views/p/refresh", follow_redirects=True)
+
+    assert "Views derivadas não atualizadas" in response.get_data(as_text=True)